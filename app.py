@@ -1,11 +1,40 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import io
+import pathlib
+from collections import OrderedDict
+from typing import Literal
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
+from pyshacl import ShapesGraph, Validator
+from pyshacl.errors import ValidationFailure
+from pyshacl.graph_abstraction import DataGraph
+import orjson
 import rdflib
-from rdflib import Namespace
-from rdflib.namespace import RDF, RDFS
+from rdflib import BNode, Namespace
+from rdflib.namespace import RDF, XSD
 
-app = FastAPI()
+# BLAKE3 is optional; fall back to the stdlib BLAKE2 for cache keys
+try:
+    from blake3 import blake3 as _hasher
+except ImportError:
+    from hashlib import blake2b
+    def _hasher(data):
+        return blake2b(data, digest_size=16)
+
+# Use pyoxigraph's Rust Turtle parser when it is installed
+try:
+    import pyoxigraph
+except ImportError:
+    pyoxigraph = None
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson instead of the stdlib encoder."""
+    def render(self, content):
+        return orjson.dumps(content)
+
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Enable CORS for CodePen access
 app.add_middleware(
@@ -16,6 +45,55 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+XSD_STRING = str(XSD.string)
+
+def _parse_turtle(graph, source):
+    """
+    Parses Turtle from a file path or bytes into graph. Terms and prefix
+    bindings come out as rdflib's own turtle parser produces them (plain
+    literals stay untyped, blank nodes are fresh per parse), so reports read
+    the same whichever parser runs. Relative IRIs resolve against the same
+    base rdflib uses: the file's own URI, or the working directory for
+    request bodies. Oxigraph does not distinguish an explicit ^^xsd:string
+    from a plain literal; both come out untyped.
+    """
+    if pyoxigraph is None:
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        graph.parse(source=source, format="turtle")
+        return
+
+    if isinstance(source, bytes):
+        parser = pyoxigraph.parse(
+            input=source, format=pyoxigraph.RdfFormat.TURTLE, base_iri=str(graph.absolutize(""))
+        )
+    else:
+        parser = pyoxigraph.parse(
+            path=source, format=pyoxigraph.RdfFormat.TURTLE, base_iri=pathlib.Path(source).absolute().as_uri()
+        )
+    bnodes = {}
+
+    def convert(term):
+        if isinstance(term, pyoxigraph.NamedNode):
+            return rdflib.URIRef(term.value)
+        if isinstance(term, pyoxigraph.BlankNode):
+            node = bnodes.get(term.value)
+            if node is None:
+                node = bnodes[term.value] = BNode()
+            return node
+        if term.language:
+            return rdflib.Literal(term.value, lang=term.language)
+        if term.datatype.value == XSD_STRING:
+            return rdflib.Literal(term.value)
+        return rdflib.Literal(term.value, datatype=rdflib.URIRef(term.datatype.value))
+
+    graph.addN(
+        (convert(quad.subject), convert(quad.predicate), convert(quad.object), graph)
+        for quad in parser
+    )
+    for prefix, namespace in parser.prefixes.items():
+        graph.bind(prefix, namespace)
+
 # --- CONFIGURATION ---
 # Single Source of Truth: This file now contains BOTH Ontology and SHACL Shapes
 DATA_FILE = "roles_shacl.ttl" 
@@ -24,7 +102,7 @@ DATA_FILE = "roles_shacl.ttl"
 print(f"Loading unified data from {DATA_FILE}...")
 UNIFIED_GRAPH = rdflib.Graph()
 try:
-    UNIFIED_GRAPH.parse(DATA_FILE, format="turtle")
+    _parse_turtle(UNIFIED_GRAPH, DATA_FILE)
     print("Graph loaded successfully.")
 except Exception as e:
     print(f"Error loading graph: {e}")
@@ -33,106 +111,279 @@ except Exception as e:
 SH = Namespace("http://www.w3.org/ns/shacl#")
 ONT = Namespace("http://example.org/ontology/")
 
+# Namespace attribute access builds a new URIRef each time; bind the terms
+# used on request paths once.
+SH_NODESHAPE = SH.NodeShape
+SH_PROPERTY = SH.property
+SH_PATH = SH.path
+ONT_EVOKES = ONT.evokes
+ONT_VERB_TYPE = ONT.Verb
+RDF_TYPE = RDF.type
+
+def _first_obj(graph, s, p):
+    # Like graph.value(s, p), without draining the rest of the matches to
+    # check for uniqueness
+    triple = next(graph.triples((s, p, None)), None)
+    return triple[2] if triple is not None else None
+
+# --- FORMS CACHE ---
+# The graph is never modified after load, so the form definitions are
+# computed once here instead of walking the graph on every request.
+FORMS_QUERY = """
+SELECT ?shape ?target_class ?prop ?path ?name ?min_count WHERE {
+    ?shape a sh:NodeShape ;
+        sh:targetClass ?target_class .
+    OPTIONAL {
+        ?shape sh:property ?prop .
+        ?prop sh:path ?path ;
+            sh:name ?name .
+        OPTIONAL { ?prop sh:minCount ?min_count }
+    }
+}
+"""
+
+def _build_forms_cache(graph):
+    # One query instead of nested subjects/objects/value walks; shapes
+    # without usable properties still come back (unbound ?path) so they
+    # map to an empty field list, as before. Multi-valued targetClass,
+    # sh:name or sh:minCount multiply the rows, so, like value(), only the
+    # first row per shape and per property is used.
+    shape_fields = {}
+    for shape, target_class, prop, path, name, min_count in graph.query(FORMS_QUERY, initNs={"sh": SH}):
+        if shape not in shape_fields:
+            shape_fields[shape] = (str(target_class).split("/")[-1], [], set())
+        _, fields, seen_props = shape_fields[shape]
+        if path is None or prop in seen_props:
+            continue
+        seen_props.add(prop)
+        fields.append({
+            "path": str(path),
+            "name": str(name),
+            "required": (min_count is not None and int(min_count) > 0)
+        })
+
+    forms = {}
+    for shape_name, fields, _ in shape_fields.values():
+        forms[shape_name] = fields
+    return forms
+
+FORMS_CACHE = _build_forms_cache(UNIFIED_GRAPH)
+FORMS_JSON = orjson.dumps({"forms": FORMS_CACHE})
+FORMS_ETAG = '"{}"'.format(_hasher(FORMS_JSON).hexdigest())
+FORMS_HEADERS = {"ETag": FORMS_ETAG, "Cache-Control": "public, max-age=3600"}
+
+# --- VERB INDEX ---
+# Local name of each verb -> its situation mappings, built with the same
+# graph calls the lookup handler used to make per request so mapping order
+# and the chosen domain/VN class are unchanged. Verbs typed :Verb but
+# evoking nothing map to an empty list.
+def _build_verb_index(graph):
+    semantic_domain = ONT.semantic_domain
+    vn_class = ONT.vn_class
+    verbs = dict.fromkeys(graph.subjects(ONT_EVOKES, None))
+    verbs.update(dict.fromkeys(graph.subjects(RDF_TYPE, ONT_VERB_TYPE)))
+
+    index = {}
+    for verb in verbs:
+        if not verb.startswith(ONT):
+            continue
+        # Each situation the verb evokes, with the verb's Semantic Domain
+        # (fallback for SHACL) and VerbNet class
+        domain = _first_obj(graph, verb, semantic_domain)
+        vn = _first_obj(graph, verb, vn_class)
+        index[verb[len(ONT):]] = [
+            {
+                "situation": str(situation).split("/")[-1],
+                "fallback_domain": str(domain).split("/")[-1] if domain else None,
+                "vn_class": str(vn).split("/")[-1] if vn else "Unknown"
+            }
+            for situation in graph.objects(verb, ONT_EVOKES)
+        ]
+    return index
+
+VERB_INDEX = _build_verb_index(UNIFIED_GRAPH)
+
+# --- SHAPES GRAPH ---
+# pyshacl.validate() rebuilds the ShapesGraph (and re-harvests every shape)
+# on each call. Harvest once here and hand the same instance to each run.
+SHAPES_GRAPH = ShapesGraph(UNIFIED_GRAPH)
+SHAPES_GRAPH.shapes  # triggers the shapes harvest
+
+class _PrebuiltShapesValidator(Validator):
+    """
+    Validator that always uses SHAPES_GRAPH. pyshacl wraps whatever
+    shacl_graph it is given in a new ShapesGraph, so it is handed an empty
+    per-request placeholder and the assignment is ignored; UNIFIED_GRAPH is
+    never wrapped (or written to) again.
+    """
+    @property
+    def shacl_graph(self):
+        return SHAPES_GRAPH
+
+    @shacl_graph.setter
+    def shacl_graph(self, value):
+        pass
+
+def _run_validation(data_graph, inference):
+    # data_graph is parsed per request and thrown away afterwards, so let
+    # pyshacl mix the ontology into it in place rather than cloning it first
+    validator = _PrebuiltShapesValidator(
+        DataGraph.from_rdflib(data_graph),
+        shacl_graph=rdflib.Graph(),
+        ont_graph=UNIFIED_GRAPH,
+        options={
+            "inference": inference,
+            "inplace": True,
+            "abort_on_first": False,
+            "debug": False,
+        },
+    )
+    try:
+        conforms, report_graph, report_text = validator.run()
+    except ValidationFailure as e:
+        return False, "Validation Failure - {}".format(e.message)
+    return conforms, report_text
+
+# --- VALIDATION CACHE ---
+# Maps a digest of the submitted Turtle to its response dict. The
+# shapes never change after load, so a result stays valid for the process
+# lifetime; clear VALIDATION_CACHE if the graph is ever reloaded.
+VALIDATION_CACHE_SIZE = 1024
+VALIDATION_CACHE = OrderedDict()
+
+def _cache_key(turtle_data, inference):
+    hasher = _hasher(inference.encode("utf-8"))
+    hasher.update(b"\0")
+    hasher.update(turtle_data)
+    return hasher.digest()
+
+# Graphs up to this size are also cached under a digest of their sorted
+# triples and prefix bindings, so resubmissions that only differ in
+# whitespace, prefix declaration order or statement order still hit the
+# cache. The bindings are part of the key because pyshacl renders
+# report_text with the data graph's prefixes.
+CANONICAL_MAX_TRIPLES = 10000
+
+def _canonical_key(data_graph, inference):
+    if len(data_graph) > CANONICAL_MAX_TRIPLES:
+        return None
+    lines = []
+    for triple in data_graph:
+        # Blank node labels are assigned per parse, so they never match
+        if any(isinstance(term, BNode) for term in triple):
+            return None
+        lines.append(" ".join(term.n3() for term in triple))
+    lines.sort()
+    lines.extend(sorted("@prefix {}: <{}>".format(prefix, namespace)
+                        for prefix, namespace in data_graph.namespaces()))
+    hasher = _hasher(inference.encode("utf-8"))
+    hasher.update(b"\1")
+    hasher.update("\n".join(lines).encode("utf-8"))
+    return hasher.digest()
+
+def _cache_get(key):
+    result = VALIDATION_CACHE.get(key)
+    if result is not None:
+        VALIDATION_CACHE.move_to_end(key)
+    return result
+
+def _cache_put(key, result):
+    VALIDATION_CACHE[key] = result
+    if len(VALIDATION_CACHE) > VALIDATION_CACHE_SIZE:
+        VALIDATION_CACHE.popitem(last=False)
+
 # --- DATA MODELS ---
+InferenceMode = Literal["none", "rdfs", "owlrl", "both"]
+
 class ValidateRequest(BaseModel):
     turtle_data: str
+    # RDFS closure over the mixed-in ontology dominates validation time,
+    # so clients opt in to it explicitly
+    inference: InferenceMode = "none"
 
 # --- ENDPOINTS ---
 
 @app.get("/api/forms")
-def get_forms():
+async def get_forms(request: Request):
     """
     Returns form definitions based on SHACL NodeShapes in the unified graph.
+    The payload is built and serialized once at startup (see FORMS_JSON), so
+    clients revalidating with If-None-Match get an empty 304.
     """
-    forms = {}
-    for shape in UNIFIED_GRAPH.subjects(RDF.type, SH.NodeShape):
-        target_class = UNIFIED_GRAPH.value(shape, SH.targetClass)
-        if not target_class:
-            continue
-            
-        shape_name = str(target_class).split("/")[-1]
-        fields = []
-        
-        for prop in UNIFIED_GRAPH.objects(shape, SH.property):
-            path = UNIFIED_GRAPH.value(prop, SH.path)
-            name = UNIFIED_GRAPH.value(prop, SH.name)
-            min_count = UNIFIED_GRAPH.value(prop, SH.minCount)
-            
-            if path and name:
-                fields.append({
-                    "path": str(path),
-                    "name": str(name),
-                    "required": (min_count is not None and int(min_count) > 0)
-                })
-        forms[shape_name] = fields
-    return {"forms": forms}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        etags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if FORMS_ETAG in etags or "*" in etags:
+            return Response(status_code=304, headers=FORMS_HEADERS)
+    return Response(content=FORMS_JSON, media_type="application/json", headers=FORMS_HEADERS)
 
 @app.get("/api/lookup")
-def lookup_verb(verb: str):
+async def lookup_verb(verb: str):
     """
-    Queries the unified graph for a verb's Situation and Semantic Domain.
+    Looks up a verb's Situations and Semantic Domain in the precomputed VERB_INDEX.
     """
     verb_clean = verb.lower().strip().replace(" ", "_")
-    verb_uri = ONT[verb_clean]
-    
-    results = []
-    
-    # 1. Find all situations the verb evokes
-    situations = list(UNIFIED_GRAPH.objects(verb_uri, ONT.evokes))
-    
-    if not situations:
-        # Fallback: Check if verb exists at all
-        if (verb_uri, RDF.type, ONT.Verb) in UNIFIED_GRAPH:
-             return {"found": True, "verb": verb, "mappings": [], "message": "Verb exists but no situations mapped."}
-        return {"found": False, "message": f"Verb '{verb}' not found in ontology."}
+    mappings = VERB_INDEX.get(verb_clean)
 
-    for sit in situations:
-        sit_name = str(sit).split("/")[-1]
-        
-        # 2. Find the Semantic Domain (Fallback for SHACL)
-        domain = UNIFIED_GRAPH.value(verb_uri, ONT.semantic_domain)
-        domain_name = str(domain).split("/")[-1] if domain else None
-        
-        # 3. Get VN Class
-        vn = UNIFIED_GRAPH.value(verb_uri, ONT.vn_class)
-        vn_name = str(vn).split("/")[-1] if vn else "Unknown"
-
-        results.append({
-            "situation": sit_name,
-            "fallback_domain": domain_name,
-            "vn_class": vn_name
-        })
+    if mappings is None:
+        return {"found": False, "message": f"Verb '{verb}' not found in ontology."}
+    if not mappings:
+        return {"found": True, "verb": verb, "mappings": [], "message": "Verb exists but no situations mapped."}
 
     return {
-        "found": True, 
-        "verb": verb, 
-        "mappings": results
+        "found": True,
+        "verb": verb,
+        "mappings": mappings
     }
 
-@app.post("/api/validate")
-def validate_graph(request: ValidateRequest):
-    from pyshacl import validate
+def _parse_data_graph(turtle_data, inference):
     data_graph = rdflib.Graph()
+    _parse_turtle(data_graph, turtle_data)
+    # Computed before validation, which mixes the ontology into data_graph
+    return data_graph, _canonical_key(data_graph, inference)
+
+async def _validate_turtle(turtle_data, inference):
+    key = _cache_key(turtle_data, inference)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    # Parsing, canonicalizing and pyshacl are CPU-bound, so all of them
+    # run off the event loop
     try:
-        data_graph.parse(data=request.turtle_data, format="turtle")
+        data_graph, canonical_key = await asyncio.to_thread(_parse_data_graph, turtle_data, inference)
     except Exception as e:
         return {"conforms": False, "detail": str(e)}
 
+    if canonical_key is not None:
+        cached = _cache_get(canonical_key)
+        if cached is not None:
+            _cache_put(key, cached)
+            return cached
+
     # Validate using the Unified Graph as both the SHACL file and the Ontology file
-    conforms, report_graph, report_text = validate(
-        data_graph,
-        shacl_graph=UNIFIED_GRAPH,
-        ont_graph=UNIFIED_GRAPH,
-        inference='rdfs',
-        abort_on_first=False,
-        meta_shacl=False,
-        debug=False
-    )
-    
-    return {
+    conforms, report_text = await asyncio.to_thread(_run_validation, data_graph, inference)
+    result = {
         "conforms": conforms,
         "report_text": report_text
     }
+    _cache_put(key, result)
+    if canonical_key is not None:
+        _cache_put(canonical_key, result)
+    return result
+
+@app.post("/api/validate")
+async def validate_graph(request: ValidateRequest):
+    # Encoded once; the bytes are both hashed and handed to the parser
+    return await _validate_turtle(request.turtle_data.encode("utf-8"), request.inference)
+
+@app.post("/api/validate/raw")
+async def validate_graph_raw(request: Request, inference: InferenceMode = "none"):
+    """
+    Same as /api/validate, but takes the Turtle document itself as the
+    request body (Content-Type: text/turtle), skipping the JSON wrapper.
+    """
+    return await _validate_turtle(await request.body(), inference)
 
 @app.get("/api/stats")
 def get_stats():
@@ -140,23 +391,23 @@ def get_stats():
     Returns counts of Shapes, Roles, Lemmas (Verbs), and Senses (Mappings).
     """
     # 1. Count Shapes
-    shapes = len(list(UNIFIED_GRAPH.subjects(RDF.type, SH.NodeShape)))
+    shapes = len(list(UNIFIED_GRAPH.subjects(RDF_TYPE, SH_NODESHAPE)))
     
     # 2. Count Unique Roles (Paths used in SHACL)
     unique_roles = set()
-    for shape in UNIFIED_GRAPH.subjects(RDF.type, SH.NodeShape):
-        for prop in UNIFIED_GRAPH.objects(shape, SH.property):
-            path = UNIFIED_GRAPH.value(prop, SH.path)
+    for shape in UNIFIED_GRAPH.subjects(RDF_TYPE, SH_NODESHAPE):
+        for prop in UNIFIED_GRAPH.objects(shape, SH_PROPERTY):
+            path = _first_obj(UNIFIED_GRAPH, prop, SH_PATH)
             if path:
                 unique_roles.add(path)
 
     # 3. Count Lemmas (Unique Subjects that are Verbs or evoke something)
-    lemmas = set(UNIFIED_GRAPH.subjects(RDF.type, ONT.Verb))
-    for s, p, o in UNIFIED_GRAPH.triples((None, ONT.evokes, None)):
+    lemmas = set(UNIFIED_GRAPH.subjects(RDF_TYPE, ONT_VERB_TYPE))
+    for s, p, o in UNIFIED_GRAPH.triples((None, ONT_EVOKES, None)):
         lemmas.add(s)
 
     # 4. Count Senses (Total number of evokes triples)
-    senses = len(list(UNIFIED_GRAPH.triples((None, ONT.evokes, None))))
+    senses = len(list(UNIFIED_GRAPH.triples((None, ONT_EVOKES, None))))
 
     return {
         "shapes": shapes,